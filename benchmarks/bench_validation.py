@@ -0,0 +1,107 @@
+"""
+VALIDATION THROUGHPUT BENCHMARK
+
+Compares per-row model validation against batch validation through the
+list TypeAdapters for PatientCreate and AppointmentCreate. Each figure is
+the best of several runs, each started with cleared normalizer caches.
+
+    python benchmarks/bench_validation.py [rows]
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from schemas import schemas  # noqa: E402
+
+
+def patient_rows(n: int) -> list[dict]:
+    """patient payloads with a realistic share of repeated contact values"""
+    return [
+        {
+            "first_name": "John",
+            "last_name": f"Doe{i}",
+            "email": f"john.doe{i % 5000}@Example.com",
+            "phone": f"(555) 010-{i % 5000:04d}",
+        }
+        for i in range(n)
+    ]
+
+
+def appointment_rows(n: int) -> list[dict]:
+    """appointment payloads spread over a year of slots"""
+    return [
+        {
+            "patient_id": i % 5000,
+            "doctor_id": i % 50,
+            "reason": "Check-up",
+            "apt_start": f"2030-{i % 12 + 1:02d}-{i % 28 + 1:02d}T09:00:00+00:00",
+            "apt_duration": 30,
+        }
+        for i in range(n)
+    ]
+
+
+def _clear_caches() -> None:
+    """every measurement starts from cold normalizer caches"""
+    schemas.normalize_phone.cache_clear()
+    schemas.normalize_email.cache_clear()
+
+
+def rows_per_sec(label: str, rows: int, func, repeat: int = 5) -> None:
+    """warm up, then print the best throughput of repeat cold-cache runs"""
+    _clear_caches()
+    func()
+    best = float("inf")
+    for _ in range(repeat):
+        _clear_caches()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<40} {rows / best:>12,.0f} rows/sec")
+
+
+def main(n: int) -> None:
+    """run every benchmark for n rows"""
+    patients = patient_rows(n)
+    patients_json = json.dumps(patients).encode()
+    appointments = appointment_rows(n)
+    appointments_json = json.dumps(appointments).encode()
+
+    rows_per_sec(
+        "PatientCreate per-row",
+        n,
+        lambda: [schemas.PatientCreate.model_validate(row) for row in patients],
+    )
+    rows_per_sec(
+        "PatientCreate batch (python)",
+        n,
+        lambda: schemas.PatientCreateList.validate_python(patients),
+    )
+    rows_per_sec(
+        "PatientCreate batch (json)",
+        n,
+        lambda: schemas.PatientCreateList.validate_json(patients_json),
+    )
+    rows_per_sec(
+        "AppointmentCreate per-row",
+        n,
+        lambda: [schemas.AppointmentCreate.model_validate(row) for row in appointments],
+    )
+    rows_per_sec(
+        "AppointmentCreate batch (python)",
+        n,
+        lambda: schemas.AppointmentCreateList.validate_python(appointments),
+    )
+    rows_per_sec(
+        "AppointmentCreate batch (json)",
+        n,
+        lambda: schemas.AppointmentCreateList.validate_json(appointments_json),
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,11 @@
+-- Links existing appointments to recurring series.
+--
+-- create_all only creates missing tables, so on a database that already has
+-- varun_appointments the new column must be added by hand. Run after the app
+-- has started once (varun_appointment_series must exist for the FK).
+
+ALTER TABLE varun_appointments
+    ADD COLUMN series_id INTEGER NULL,
+    ADD CONSTRAINT fk_varun_appointments_series_id
+        FOREIGN KEY (series_id) REFERENCES varun_appointment_series (series_id),
+    ADD INDEX ix_varun_appointments_series_id (series_id);
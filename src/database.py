@@ -23,6 +23,18 @@ def get_engine():
     return _ENGINE
 
 
+def pool_capacity(engine) -> int | None:
+    """connections the engine's pool can hand out at once, None when unbounded"""
+    pool = engine.pool
+    if not hasattr(pool, "size"):
+        return None
+    # QueuePool keeps max_overflow private, -1 means unbounded
+    max_overflow = getattr(pool, "_max_overflow", 0)
+    if max_overflow < 0:
+        return None
+    return pool.size() + max_overflow
+
+
 def get_sessionlocal():
     global _SessionLocal
     if _SessionLocal is None:
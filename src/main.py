@@ -1,20 +1,42 @@
+import asyncio
+import os
 from datetime import date
+from typing import Literal
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, Query
+from fastapi.exception_handlers import request_validation_exception_handler
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from database import get_engine, get_db
+from database import get_engine, get_db, get_sessionlocal, pool_capacity
+from middleware.admission import (
+    AdmissionControlMiddleware,
+    InMemoryRateLimitStore,
+    RedisRateLimitStore,
+)
 from models import models
 from schemas import schemas
 from services import crud
+from services.health import HealthMonitor
+from services.outbox import FileSink, OutboxDispatcher
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     engine = get_engine()
     models.Base.metadata.create_all(bind=engine)
+    health_monitor.start()
+    if OUTBOX_DISPATCHER_ENABLED:
+        outbox_dispatcher.start()
     yield
+    await outbox_dispatcher.stop()
+    await health_monitor.stop()
+
 
+# set OUTBOX_DISPATCHER=0 on workers that must not publish, e.g. in tests
+OUTBOX_DISPATCHER_ENABLED = os.getenv("OUTBOX_DISPATCHER", "1") != "0"
 
 app = FastAPI(
     title="Patient Encounter System",
@@ -22,6 +44,54 @@ app = FastAPI(
 )
 
 
+@app.exception_handler(RequestValidationError)
+async def readable_validation_errors(request, exc: RequestValidationError):
+    """swap raw regex mismatches on contact fields for readable messages"""
+    errors = []
+    for error in exc.errors():
+        pattern = error.get("ctx", {}).get("pattern")
+        if (
+            error["type"] == "string_pattern_mismatch"
+            and pattern in schemas.PATTERN_MESSAGES
+        ):
+            error = {
+                key: value for key, value in error.items() if key not in ("ctx", "url")
+            }
+            error["type"] = "value_error"
+            error["msg"] = "Value error, " + schemas.PATTERN_MESSAGES[pattern]
+        errors.append(error)
+    return await request_validation_exception_handler(
+        request, RequestValidationError(errors, body=exc.body)
+    )
+
+
+# share rate limit buckets across workers when a Redis URL is configured
+_RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL")
+rate_limit_store = (
+    RedisRateLimitStore(_RATE_LIMIT_REDIS_URL)
+    if _RATE_LIMIT_REDIS_URL
+    else InMemoryRateLimitStore()
+)
+# comma-separated keys that get their own bucket instead of the client IP's
+_RATE_LIMIT_API_KEYS = [
+    key for key in os.getenv("RATE_LIMIT_API_KEYS", "").split(",") if key
+]
+app.add_middleware(
+    AdmissionControlMiddleware,
+    store=rate_limit_store,
+    # route class limits are carved out of the DB pool so bursts shed with 503
+    # instead of queueing on pool checkout
+    capacity=pool_capacity(get_engine()),
+    api_keys=_RATE_LIMIT_API_KEYS,
+)
+
+health_monitor = HealthMonitor(get_engine, cache=rate_limit_store)
+outbox_dispatcher = OutboxDispatcher(
+    lambda: get_sessionlocal()(),
+    sink=FileSink(os.getenv("OUTBOX_FILE", "outbox_events.jsonl")),
+)
+
+
 @app.get("/")
 def greet():
     """Home page placeholder"""
@@ -40,6 +110,21 @@ def create_patient(payload: schemas.PatientCreate, db: Session = Depends(get_db)
     return crud.create_patient(db, payload)
 
 
+@app.get("/patients/{patient_id}/appointments", response_model=schemas.AppointmentPage)
+def get_patient_appointments(
+    patient_id: int,
+    when: Literal["upcoming", "past"] = "upcoming",
+    cursor: str | None = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """API endpoint to page through a patient's upcoming or past appointments"""
+    items, next_cursor = crud.get_patient_appointments(
+        db, patient_id, when=when, cursor=cursor, limit=limit
+    )
+    return {"items": items, "next_cursor": next_cursor}
+
+
 @app.get("/doctors/{doctor_id}", response_model=schemas.DoctorRead)
 def get_doctor(doctor_id: int, db: Session = Depends(get_db)):
     """API endpoint to get doctor information by doctor id"""
@@ -68,7 +153,85 @@ def create_appointment(
     return crud.create_appointment(db, payload)
 
 
+@app.post(
+    "/appointment-series",
+    status_code=201,
+    response_model=schemas.AppointmentSeriesRead,
+)
+def create_appointment_series(
+    payload: schemas.AppointmentSeriesCreate, db: Session = Depends(get_db)
+):
+    """API endpoint to book a recurring series of appointments"""
+    return crud.create_series(db, payload)
+
+
+@app.get(
+    "/appointment-series/{series_id}", response_model=schemas.AppointmentSeriesRead
+)
+def get_appointment_series(series_id: int, db: Session = Depends(get_db)):
+    """API endpoint to get a series with its occurrences"""
+    return crud.get_series_by_id(db, series_id)
+
+
+@app.patch(
+    "/appointment-series/{series_id}", response_model=schemas.AppointmentSeriesRead
+)
+def update_appointment_series(
+    series_id: int,
+    payload: schemas.AppointmentSeriesUpdate,
+    db: Session = Depends(get_db),
+):
+    """API endpoint to edit all upcoming occurrences of a series"""
+    return crud.update_series(db, series_id, payload)
+
+
+@app.delete(
+    "/appointment-series/{series_id}", response_model=schemas.AppointmentSeriesRead
+)
+def cancel_appointment_series(series_id: int, db: Session = Depends(get_db)):
+    """API endpoint to cancel all upcoming occurrences of a series"""
+    return crud.cancel_series(db, series_id)
+
+
+@app.get("/events", response_model=schemas.EventPage)
+async def get_events(
+    after: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    wait: float = Query(0, ge=0, le=30),
+    db: Session = Depends(get_db),
+):
+    """API endpoint to read change events past a publish sequence, long-polling up to wait seconds"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + wait
+    while True:
+        # taken before the query so a publish in between still wakes us
+        published = outbox_dispatcher.next_publish()
+        events = await run_in_threadpool(crud.get_events_after, db, after, limit)
+        remaining = deadline - loop.time()
+        if events or remaining <= 0:
+            break
+        # hand the connection back to the pool while parked
+        await run_in_threadpool(db.close)
+        await outbox_dispatcher.wait_for_events(remaining, published)
+
+    next_cursor = events[-1].publish_seq if events else after
+    return {"events": events, "next_cursor": next_cursor}
+
+
 @app.get("/health")
 async def health_check():
     """fastapi health check"""
     return {"status": "UP"}
+
+
+@app.get("/health/live")
+async def liveness_check():
+    """liveness probe, the event loop is answering"""
+    return {"status": "UP"}
+
+
+@app.get("/health/ready")
+async def readiness_check():
+    """readiness probe, serves the background monitor's cached result"""
+    snapshot = health_monitor.snapshot
+    return JSONResponse(snapshot, status_code=200 if health_monitor.ready else 503)
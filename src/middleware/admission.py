@@ -0,0 +1,270 @@
+"""
+ADMISSION CONTROL MIDDLEWARE
+
+Sheds load before it reaches the threadpool and the DB pool: per-client
+token buckets answer 429, per-route-class concurrency limits answer 503
+once a request would queue longer than its latency target. Health probes
+bypass both.
+"""
+
+import asyncio
+import hashlib
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from starlette.responses import JSONResponse
+
+BYPASS_PREFIXES = ("/health",)
+BOOKING_PREFIXES = ("/appointments", "/appointment-series")
+STREAM_PREFIXES = ("/events",)
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+@dataclass(frozen=True)
+class RouteLimit:
+    """concurrency budget for one class of routes"""
+
+    max_concurrency: int
+    max_queue: int
+    max_wait: float
+
+
+# anyio's default threadpool size, sync handlers beyond it queue for a thread
+THREADPOOL_TOKENS = 40
+# SQLAlchemy's default QueuePool: pool_size 5 + max_overflow 10
+DEFAULT_CAPACITY = 15
+POOLED_CLASSES = ("booking", "write", "read")
+# long-polls park on the loop and release their connection while parked,
+# so they are kept out of the pool budget
+STREAM_LIMIT = RouteLimit(max_concurrency=64, max_queue=0, max_wait=0.1)
+
+
+def limits_for_capacity(capacity: int) -> dict[str, RouteLimit]:
+    """split the pool between route classes so they never outnumber it"""
+    capacity = min(capacity, THREADPOOL_TOKENS)
+    if capacity < len(POOLED_CLASSES):
+        raise ValueError(f"Pool capacity {capacity} is too small to split")
+    booking = write = max(1, capacity // 4)
+    read = capacity - booking - write
+    return {
+        "booking": RouteLimit(
+            max_concurrency=booking, max_queue=2 * booking, max_wait=0.5
+        ),
+        "write": RouteLimit(max_concurrency=write, max_queue=2 * write, max_wait=0.5),
+        "read": RouteLimit(max_concurrency=read, max_queue=2 * read, max_wait=1.0),
+        "stream": STREAM_LIMIT,
+    }
+
+
+def validate_limits(limits: dict[str, RouteLimit], capacity: int):
+    """pooled route classes together must fit in the pool and the threadpool"""
+    missing = set(POOLED_CLASSES) - set(limits)
+    if missing:
+        raise ValueError(f"Missing route limits for: {', '.join(sorted(missing))}")
+    total = sum(limits[name].max_concurrency for name in POOLED_CLASSES)
+    budget = min(capacity, THREADPOOL_TOKENS)
+    if total > budget:
+        raise ValueError(
+            f"Route limits allow {total} concurrent handlers, "
+            f"the DB pool and threadpool only fit {budget}"
+        )
+
+
+def classify(method: str, path: str) -> str:
+    """map a request onto its route class"""
+    if method in SAFE_METHODS:
+        return "stream" if path.startswith(STREAM_PREFIXES) else "read"
+    if path.startswith(BOOKING_PREFIXES):
+        return "booking"
+    return "write"
+
+
+def hash_api_key(key: str | bytes) -> str:
+    """digest used for API key lookup and as the bucket name"""
+    if isinstance(key, str):
+        key = key.encode()
+    return hashlib.sha256(key).hexdigest()
+
+
+def client_key(scope, api_keys: frozenset[str] = frozenset()) -> str:
+    """rate limit by API key when it is a configured one, otherwise by client IP"""
+    for name, value in scope.get("headers", []):
+        if name == b"x-api-key":
+            # unknown keys are ignored, or a client could mint fresh buckets
+            digest = hash_api_key(value)
+            if digest in api_keys:
+                return "key:" + digest
+            break
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+class ConcurrencyLimiter:
+    """bounded concurrency with a bounded, time-limited queue"""
+
+    def __init__(self, limit: RouteLimit):
+        self.limit = limit
+        self._semaphore = asyncio.Semaphore(limit.max_concurrency)
+        self._waiting = 0
+
+    async def acquire(self) -> bool:
+        """take a slot, False when the queue is full or the wait runs out"""
+        if self._semaphore.locked() and self._waiting >= self.limit.max_queue:
+            return False
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(
+                self._semaphore.acquire(), timeout=self.limit.max_wait
+            )
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._waiting -= 1
+
+    def release(self):
+        """give the slot back"""
+        self._semaphore.release()
+
+
+class InMemoryRateLimitStore:
+    """token buckets kept in process memory, per worker"""
+
+    def __init__(self, max_keys: int = 100_000):
+        # least recently touched first, so eviction is O(1)
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._max_keys = max_keys
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        """take one token, returns 0 when allowed or seconds until the next token"""
+        now = time.monotonic()
+        bucket = self._buckets.pop(key, None)
+        if bucket is None:
+            if len(self._buckets) >= self._max_keys:
+                # the oldest bucket has gone longest without a request
+                self._buckets.popitem(last=False)
+            bucket = (burst, now)
+        tokens, stamp = bucket
+        tokens = min(burst, tokens + (now - stamp) * rate)
+        if tokens >= 1:
+            self._buckets[key] = (tokens - 1, now)
+            return 0.0
+        self._buckets[key] = (tokens, now)
+        return (1 - tokens) / rate
+
+    async def ping(self) -> bool:
+        """in-memory store is always reachable"""
+        return True
+
+
+# runs atomically in Redis so every worker shares the same buckets
+_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call("TIME")
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "stamp")
+local tokens = tonumber(bucket[1]) or burst
+local stamp = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + (now - stamp) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call("HSET", KEYS[1], "tokens", tokens, "stamp", now)
+redis.call("EXPIRE", KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RedisRateLimitStore:
+    """token buckets shared by every worker through Redis"""
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        try:
+            from redis import asyncio as aioredis
+        except ImportError as exc:
+            raise RuntimeError(
+                "RedisRateLimitStore requires the redis package to be installed"
+            ) from exc
+        self._redis = aioredis.from_url(url)
+        self._script = self._redis.register_script(_TOKEN_BUCKET_SCRIPT)
+        self._prefix = prefix
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        """take one token, returns 0 when allowed or seconds until the next token"""
+        wait = await self._script(keys=[self._prefix + key], args=[rate, burst])
+        return float(wait)
+
+    async def ping(self) -> bool:
+        """check the shared store is reachable"""
+        try:
+            return bool(await self._redis.ping())
+        except Exception:
+            return False
+
+
+class AdmissionControlMiddleware:
+    """ASGI middleware applying rate limits and concurrency limits"""
+
+    def __init__(
+        self,
+        app,
+        store=None,
+        rate: float = 20.0,
+        burst: int = 40,
+        limits: dict[str, RouteLimit] | None = None,
+        capacity: int | None = DEFAULT_CAPACITY,
+        api_keys: list[str] | None = None,
+    ):
+        self.app = app
+        self.api_keys = frozenset(hash_api_key(key) for key in api_keys or [])
+        self.store = store or InMemoryRateLimitStore()
+        self.rate = rate
+        self.burst = burst
+        # an unbounded pool is only limited by the threadpool
+        capacity = capacity or THREADPOOL_TOKENS
+        if limits is None:
+            limits = limits_for_capacity(capacity)
+        else:
+            limits = {"stream": STREAM_LIMIT, **limits}
+        validate_limits(limits, capacity)
+        self.limiters = {
+            name: ConcurrencyLimiter(limit) for name, limit in limits.items()
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(BYPASS_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        retry_after = await self.store.take(
+            client_key(scope, self.api_keys), self.rate, self.burst
+        )
+        if retry_after > 0:
+            await _reject(429, "Too many requests", retry_after)(scope, receive, send)
+            return
+
+        limiter = self.limiters[classify(scope["method"], scope["path"])]
+        if not await limiter.acquire():
+            response = _reject(503, "Server is busy", limiter.limit.max_wait)
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+
+def _reject(status_code: int, detail: str, retry_after: float) -> JSONResponse:
+    """fast rejection carrying a Retry-After hint"""
+    return JSONResponse(
+        {"detail": detail},
+        status_code=status_code,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
@@ -1,5 +1,14 @@
 from datetime import datetime
-from sqlalchemy import String, Integer, DateTime, Boolean, ForeignKey, Index, func
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    func,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from database import Base
 
@@ -53,12 +62,47 @@ class Doctor(Base):
     appointments: Mapped[list["Appointment"]] = relationship(back_populates="doctor")
 
 
+class AppointmentSeries(Base):
+    """
+    Represents a recurring appointment series (RRULE-style) between a patient
+    and a doctor. Occurrences are stored as regular appointments.
+    """
+
+    __tablename__ = "varun_appointment_series"
+
+    series_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    patient_id: Mapped[int] = mapped_column(
+        ForeignKey("varun_patients.pat_id"), nullable=False
+    )
+    doctor_id: Mapped[int] = mapped_column(
+        ForeignKey("varun_doctors.doc_id"), nullable=False
+    )
+    reason: Mapped[str] = mapped_column(String(200))
+    freq: Mapped[str] = mapped_column(String(10), nullable=False)
+    interval: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    count: Mapped[int | None] = mapped_column(Integer)
+    until: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    dtstart: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    apt_duration: Mapped[int] = mapped_column(Integer, nullable=False)
+    active_status: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    # pylint: disable=not-callable
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    appointments: Mapped[list["Appointment"]] = relationship(back_populates="series")
+
+
 class Appointment(Base):
     """
     Represents an appointment between a patient and a doctor.
     """
 
     __tablename__ = "varun_appointments"
+    __table_args__ = (
+        Index("idx_appointment_doctor_start", "doctor_id", "apt_start"),
+        Index("idx_appointment_patient_start", "patient_id", "apt_start"),
+    )
 
     apt_id: Mapped[int] = mapped_column(Integer, primary_key=True)
     patient_id: Mapped[int] = mapped_column(
@@ -67,6 +111,9 @@ class Appointment(Base):
     doctor_id: Mapped[int] = mapped_column(
         ForeignKey("varun_doctors.doc_id"), nullable=False
     )
+    series_id: Mapped[int | None] = mapped_column(
+        ForeignKey("varun_appointment_series.series_id"), index=True
+    )
     reason: Mapped[str] = mapped_column(String(200))
     apt_start: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, index=True
@@ -79,5 +126,43 @@ class Appointment(Base):
 
     patient: Mapped[Patient] = relationship(back_populates="appointments")
     doctor: Mapped[Doctor] = relationship(back_populates="appointments")
+    series: Mapped[AppointmentSeries | None] = relationship(
+        back_populates="appointments"
+    )
+
+
+class OutboxEvent(Base):
+    """
+    Represents a change event, written in the same transaction as the change
+    and published downstream by the outbox dispatcher.
+    """
+
+    __tablename__ = "varun_outbox_events"
+
+    event_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    aggregate_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    aggregate_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    event_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    # pylint: disable=not-callable
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    published_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), index=True
+    )
+    # assigned in commit order while publishing, the /events feed pages on it
+    publish_seq: Mapped[int | None] = mapped_column(Integer, unique=True)
+
+
+class OutboxSequence(Base):
+    """
+    Single-row counter handing out outbox publish sequence numbers. Its row
+    lock is held until the publishing transaction commits, so sequence order
+    is commit order.
+    """
+
+    __tablename__ = "varun_outbox_sequence"
 
-    Index("idx_appointment_doctor_start", "doctor_id", "apt_start")
+    seq_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    last_seq: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
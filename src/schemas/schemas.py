@@ -1,7 +1,67 @@
 import re
-from typing import Optional
-from datetime import datetime
-from pydantic import BaseModel, Field, field_validator
+from functools import lru_cache
+from typing import Annotated, Literal, Optional
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from pydantic import (
+    AfterValidator,
+    AwareDatetime,
+    BaseModel,
+    Field,
+    StringConstraints,
+    TypeAdapter,
+    model_validator,
+)
+
+# the pattern constraints run inside pydantic-core, only the normalizers
+# below are Python and they are memoized
+_NON_DIGITS = re.compile(r"\D")
+PHONE_PATTERN = r"^\D*(?:\d\D*){10,15}$"
+EMAIL_PATTERN = r"^[^@\s]+@[^@\s]+\.[^@\s]+$"
+# pydantic reports a pattern mismatch with the raw regex, these replace it
+PATTERN_MESSAGES = {
+    PHONE_PATTERN: "Phone number must be between 10 and 15 digits",
+    EMAIL_PATTERN: "Invalid email address",
+}
+
+MAX_SERIES_OCCURRENCES = 104
+SERIES_FREQ_STEP = {"DAILY": timedelta(days=1), "WEEKLY": timedelta(weeks=1)}
+
+
+@lru_cache(maxsize=65536)
+def normalize_phone(value: str) -> str:
+    """keep only the digits, memoized for repeated values"""
+    return _NON_DIGITS.sub("", value)
+
+
+@lru_cache(maxsize=65536)
+def normalize_email(value: str) -> str:
+    """lower-case the domain part, memoized for repeated values"""
+    local, _, domain = value.rpartition("@")
+    return f"{local}@{domain.lower()}"
+
+
+# PHONE_PATTERN already enforces 10 to 15 digits
+PhoneNumber = Annotated[
+    str, StringConstraints(pattern=PHONE_PATTERN), AfterValidator(normalize_phone)
+]
+EmailAddress = Annotated[
+    str,
+    StringConstraints(strip_whitespace=True, pattern=EMAIL_PATTERN),
+    AfterValidator(normalize_email),
+]
+
+
+def check_time_zone(value: str) -> str:
+    """accept only IANA zone names known to the system tz database"""
+    try:
+        ZoneInfo(value)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown time zone: {value}")
+    return value
+
+
+TimeZoneName = Annotated[str, AfterValidator(check_time_zone)]
 
 
 class ORMBase(BaseModel):
@@ -15,25 +75,8 @@ class PatientCreate(BaseModel):
 
     first_name: str
     last_name: str
-    email: str
-    phone: str
-
-    @field_validator("phone")
-    @classmethod
-    def validate_phonenum(cls, value):
-        """phone number format validation"""
-        digits = re.sub(r"\D", "", value)
-        if len(digits) < 10 or len(digits) > 15:
-            raise ValueError("Phone number must be between 10 and 15 digits")
-        return f"{digits}"
-
-    @field_validator("email")
-    @classmethod
-    def validate_email(cls, value):
-        """email address format validation"""
-        if "@" not in value:
-            raise ValueError("Invalid email address")
-        return value
+    email: EmailAddress
+    phone: PhoneNumber
 
 
 class PatientRead(ORMBase):
@@ -73,16 +116,9 @@ class AppointmentCreate(BaseModel):
     patient_id: int = Field(ge=0)
     doctor_id: int = Field(ge=0)
     reason: str = ""
-    apt_start: datetime
+    apt_start: AwareDatetime
     apt_duration: int = Field(ge=15, le=180)
 
-    @field_validator("apt_start")
-    def timezone_awareness(cls, value: datetime):
-        """timezone awareness method"""
-        if value.tzinfo is None or value.tzinfo.utcoffset(value) is None:
-            raise ValueError("apt_start must be timezone-aware")
-        return value
-
 
 class AppointmentRead(ORMBase):
     """schema to read appointment info"""
@@ -90,7 +126,103 @@ class AppointmentRead(ORMBase):
     apt_id: int
     patient_id: int
     doctor_id: int
+    series_id: Optional[int] = None
     reason: str
     apt_start: datetime
     apt_duration: int
     apt_created_at: datetime
+
+
+class AppointmentSeriesCreate(BaseModel):
+    """
+    schema to create a recurring appointment series (RRULE-style)
+
+    Occurrences repeat apt_start's wall-clock time in tz, an IANA zone such
+    as "Europe/London", so a 09:00 series stays at 09:00 across DST changes.
+    Without tz they repeat at apt_start's fixed UTC offset and shift by an
+    hour of local time whenever DST starts or ends.
+    """
+
+    patient_id: int = Field(ge=0)
+    doctor_id: int = Field(ge=0)
+    reason: str = ""
+    apt_start: AwareDatetime
+    apt_duration: int = Field(ge=15, le=180)
+    freq: Literal["DAILY", "WEEKLY"] = "WEEKLY"
+    interval: int = Field(default=1, ge=1, le=12)
+    count: Optional[int] = Field(default=None, ge=1, le=MAX_SERIES_OCCURRENCES)
+    until: Optional[AwareDatetime] = None
+    tz: Optional[TimeZoneName] = None
+
+    @model_validator(mode="after")
+    def bounded_series(self):
+        """series must end, either by count or by an until date"""
+        if self.count is None and self.until is None:
+            raise ValueError("Either count or until must be given")
+        if self.until is not None and self.until < self.apt_start:
+            raise ValueError("until must be after apt_start")
+        if self.count is None:
+            step = SERIES_FREQ_STEP[self.freq] * self.interval
+            occurrences = (self.until - self.apt_start) // step + 1
+            if occurrences > MAX_SERIES_OCCURRENCES:
+                raise ValueError(
+                    f"Series would have {occurrences} occurrences, "
+                    f"at most {MAX_SERIES_OCCURRENCES} are allowed"
+                )
+        return self
+
+
+class AppointmentSeriesUpdate(BaseModel):
+    """schema to edit the upcoming occurrences of a series"""
+
+    reason: Optional[str] = None
+    apt_duration: Optional[int] = Field(default=None, ge=15, le=180)
+
+
+class AppointmentSeriesRead(ORMBase):
+    """schema to read appointment series info"""
+
+    series_id: int
+    patient_id: int
+    doctor_id: int
+    reason: str
+    freq: str
+    interval: int
+    count: Optional[int]
+    until: Optional[datetime]
+    dtstart: datetime
+    apt_duration: int
+    active_status: bool
+    created_at: datetime
+    appointments: list[AppointmentRead] = []
+
+
+# batch validators for bulk ingest, one pydantic-core call per list
+PatientCreateList = TypeAdapter(list[PatientCreate])
+AppointmentCreateList = TypeAdapter(list[AppointmentCreate])
+
+
+class EventRead(ORMBase):
+    """schema to read a change event"""
+
+    event_id: int
+    publish_seq: int
+    aggregate_type: str
+    aggregate_id: int
+    event_type: str
+    payload: dict
+    created_at: datetime
+
+
+class EventPage(BaseModel):
+    """a page of change events and the publish sequence to resume from"""
+
+    events: list[EventRead]
+    next_cursor: int
+
+
+class AppointmentPage(BaseModel):
+    """a page of a patient's appointments and the cursor for the next one"""
+
+    items: list[AppointmentRead]
+    next_cursor: Optional[str] = None
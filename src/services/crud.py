@@ -1,10 +1,54 @@
+import base64
 from datetime import datetime, timedelta, timezone, date
+from zoneinfo import ZoneInfo
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, select, func
+from sqlalchemy import and_, delete, insert, or_, select, func, update
 from fastapi import HTTPException
 from schemas import schemas
 from models import models
 
+MAX_APT_DURATION = timedelta(minutes=180)
+
+
+def record_event(
+    db: Session, aggregate_type: str, aggregate_id: int, event_type: str, payload
+):
+    """append a change event to the outbox, committed with the caller's change"""
+    db.add(
+        models.OutboxEvent(
+            aggregate_type=aggregate_type,
+            aggregate_id=aggregate_id,
+            event_type=event_type,
+            payload=payload,
+        )
+    )
+
+
+def _appointment_payload(apt: models.Appointment) -> dict:
+    """json-safe appointment fields for change events"""
+    return {
+        "apt_id": apt.apt_id,
+        "patient_id": apt.patient_id,
+        "doctor_id": apt.doctor_id,
+        "series_id": apt.series_id,
+        "reason": apt.reason,
+        "apt_start": _as_utc(apt.apt_start).isoformat(),
+        "apt_duration": apt.apt_duration,
+    }
+
+
+def get_events_after(
+    db: Session, after: int, limit: int = 100
+) -> list[models.OutboxEvent]:
+    """database operation to read published change events past a publish sequence"""
+    query = (
+        select(models.OutboxEvent)
+        .where(models.OutboxEvent.publish_seq > after)
+        .order_by(models.OutboxEvent.publish_seq)
+        .limit(limit)
+    )
+    return db.execute(query).scalars().all()
+
 
 def get_patient_by_id(db: Session, patient_id: int) -> models.Patient:
     """database operation to get patient by id"""
@@ -44,6 +88,10 @@ def create_patient(db: Session, payload: schemas.PatientCreate) -> models.Patien
     try:
         patient = models.Patient(**payload.model_dump())
         db.add(patient)
+        db.flush()
+        record_event(
+            db, "patient", patient.pat_id, "patient.created", payload.model_dump()
+        )
         db.commit()
         db.refresh(patient)
 
@@ -57,6 +105,10 @@ def create_doctor(db: Session, payload: schemas.DoctorCreate) -> models.Doctor:
     try:
         doctor = models.Doctor(**payload.model_dump())
         db.add(doctor)
+        db.flush()
+        record_event(
+            db, "doctor", doctor.doc_id, "doctor.created", payload.model_dump()
+        )
         db.commit()
         db.refresh(doctor)
         return doctor
@@ -82,9 +134,15 @@ def create_appointment(
             status_code=400, detail="Doctor is inactive or doesn't exist"
         )
 
+    # one query over both (doctor_id, apt_start) and (patient_id, apt_start)
+    # indexes, bounded below so history length doesn't matter
     overlap_stmt = select(models.Appointment).where(
         and_(
-            models.Appointment.doctor_id == payload.doctor_id,
+            or_(
+                models.Appointment.doctor_id == payload.doctor_id,
+                models.Appointment.patient_id == payload.patient_id,
+            ),
+            models.Appointment.apt_start >= start_time - MAX_APT_DURATION,
             models.Appointment.apt_start < end_time,
             func.date_add(
                 models.Appointment.apt_start,
@@ -94,11 +152,15 @@ def create_appointment(
         )
     )
     print(f"Overlap query: {overlap_stmt}")
-    overlap = db.execute(overlap_stmt).scalars().first()
-    if overlap:
+    overlaps = db.execute(overlap_stmt).scalars().all()
+    if any(apt.doctor_id == payload.doctor_id for apt in overlaps):
         raise HTTPException(
             status_code=409, detail="Doctor has a conflicting appointment"
         )
+    if overlaps:
+        raise HTTPException(
+            status_code=409, detail="Patient has a conflicting appointment"
+        )
 
     apt = models.Appointment(
         patient_id=payload.patient_id,
@@ -109,6 +171,380 @@ def create_appointment(
     )
 
     db.add(apt)
+    db.flush()
+    record_event(
+        db, "appointment", apt.apt_id, "appointment.created", _appointment_payload(apt)
+    )
     db.commit()
     db.refresh(apt)
     return apt
+
+
+def _as_utc(value: datetime) -> datetime:
+    """normalise a stored datetime to UTC, MySQL hands them back naive"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def expand_occurrences(
+    start: datetime,
+    freq: str,
+    interval: int = 1,
+    count: int | None = None,
+    until: datetime | None = None,
+    tz: str | None = None,
+):
+    """lazily yield the start times of an RRULE-style series"""
+    step = schemas.SERIES_FREQ_STEP[freq] * interval
+    limit = min(count or schemas.MAX_SERIES_OCCURRENCES, schemas.MAX_SERIES_OCCURRENCES)
+    # step in local wall time, the zone picks each occurrence's own UTC offset
+    zone = ZoneInfo(tz) if tz else None
+    wall = start.astimezone(zone).replace(tzinfo=None) if zone else None
+    for n in range(limit):
+        if zone:
+            occurrence = (wall + step * n).replace(tzinfo=zone)
+        else:
+            occurrence = start + step * n
+        if until is not None and occurrence > until:
+            return
+        yield occurrence
+
+
+def find_conflicts(
+    slots: list[tuple[datetime, datetime]], booked: list[tuple[datetime, datetime]]
+) -> list[datetime]:
+    """sweep start-sorted slots against bookings, return starts of slots that overlap"""
+    booked = sorted(booked)
+    conflicts = []
+    first = 0
+    for start, end in sorted(slots):
+        # bookings ending before this slot can't touch any later slot either
+        while first < len(booked) and booked[first][1] <= start:
+            first += 1
+        idx = first
+        while idx < len(booked) and booked[idx][0] < end:
+            if booked[idx][1] > start:
+                conflicts.append(start)
+                break
+            idx += 1
+    return conflicts
+
+
+def _booked_intervals(
+    db: Session,
+    doctor_id: int,
+    patient_id: int,
+    window_start: datetime,
+    window_end: datetime,
+    exclude_series: int | None = None,
+) -> tuple[list[tuple[datetime, datetime]], list[tuple[datetime, datetime]]]:
+    """single range query for the doctor's and the patient's bookings in the window"""
+    query = select(
+        models.Appointment.doctor_id,
+        models.Appointment.patient_id,
+        models.Appointment.apt_start,
+        models.Appointment.apt_duration,
+    ).where(
+        or_(
+            models.Appointment.doctor_id == doctor_id,
+            models.Appointment.patient_id == patient_id,
+        ),
+        models.Appointment.apt_start >= window_start - MAX_APT_DURATION,
+        models.Appointment.apt_start < window_end,
+    )
+    if exclude_series is not None:
+        query = query.where(
+            (models.Appointment.series_id.is_(None))
+            | (models.Appointment.series_id != exclude_series)
+        )
+
+    doctor_booked, patient_booked = [], []
+    for row in db.execute(query).all():
+        start = _as_utc(row.apt_start)
+        interval = (start, start + timedelta(minutes=row.apt_duration))
+        if row.doctor_id == doctor_id:
+            doctor_booked.append(interval)
+        if row.patient_id == patient_id:
+            patient_booked.append(interval)
+    return doctor_booked, patient_booked
+
+
+def _raise_on_conflicts(
+    db: Session,
+    doctor_id: int,
+    patient_id: int,
+    slots: list[tuple[datetime, datetime]],
+    exclude_series: int | None = None,
+):
+    """check all slots against the doctor's and patient's schedules with one query"""
+    doctor_booked, patient_booked = _booked_intervals(
+        db,
+        doctor_id,
+        patient_id,
+        slots[0][0],
+        slots[-1][1],
+        exclude_series=exclude_series,
+    )
+    for who, booked in (("Doctor", doctor_booked), ("Patient", patient_booked)):
+        conflicts = find_conflicts(slots, booked)
+        if conflicts:
+            dates = ", ".join(conflict.isoformat() for conflict in conflicts)
+            raise HTTPException(
+                status_code=409,
+                detail=f"{who} has conflicting appointments on: {dates}",
+            )
+
+
+def get_series_by_id(db: Session, series_id: int) -> models.AppointmentSeries:
+    """database operation to get appointment series by id"""
+    series = db.get(models.AppointmentSeries, series_id)
+    if not series:
+        raise HTTPException(status_code=404, detail="Appointment series not found")
+    return series
+
+
+def _series_rows(db: Session, condition, lock: bool = False) -> list:
+    """(apt_id, apt_start) of the matching occurrences in start order"""
+    query = (
+        select(models.Appointment.apt_id, models.Appointment.apt_start)
+        .where(condition)
+        .order_by(models.Appointment.apt_start)
+    )
+    if lock:
+        # keeps the set stable between the read and the bulk write
+        query = query.with_for_update()
+    return db.execute(query).all()
+
+
+def create_series(
+    db: Session, payload: schemas.AppointmentSeriesCreate
+) -> models.AppointmentSeries:
+    """database operation to create a recurring series and all its occurrences"""
+    occurrences = [
+        occurrence.astimezone(timezone.utc)
+        for occurrence in expand_occurrences(
+            payload.apt_start,
+            payload.freq,
+            payload.interval,
+            payload.count,
+            payload.until,
+            payload.tz,
+        )
+    ]
+
+    if occurrences[0] <= datetime.now(timezone.utc):
+        raise HTTPException(
+            status_code=400, detail="Appointments must be scheduled at a later time"
+        )
+
+    doctor = db.get(models.Doctor, payload.doctor_id)
+    if not doctor or not doctor.active_status:
+        raise HTTPException(
+            status_code=400, detail="Doctor is inactive or doesn't exist"
+        )
+
+    duration = timedelta(minutes=payload.apt_duration)
+    slots = [(start, start + duration) for start in occurrences]
+    _raise_on_conflicts(db, payload.doctor_id, payload.patient_id, slots)
+
+    series = models.AppointmentSeries(
+        patient_id=payload.patient_id,
+        doctor_id=payload.doctor_id,
+        reason=payload.reason,
+        freq=payload.freq,
+        interval=payload.interval,
+        count=payload.count,
+        until=payload.until,
+        dtstart=occurrences[0],
+        apt_duration=payload.apt_duration,
+        active_status=True,
+    )
+    db.add(series)
+    db.flush()
+
+    db.execute(
+        insert(models.Appointment),
+        [
+            {
+                "patient_id": payload.patient_id,
+                "doctor_id": payload.doctor_id,
+                "series_id": series.series_id,
+                "reason": payload.reason,
+                "apt_start": start,
+                "apt_duration": payload.apt_duration,
+            }
+            for start in occurrences
+        ],
+    )
+    # one read back for the ids the executemany assigned
+    rows = _series_rows(db, models.Appointment.series_id == series.series_id)
+    record_event(
+        db,
+        "series",
+        series.series_id,
+        "series.created",
+        {
+            "series_id": series.series_id,
+            "patient_id": payload.patient_id,
+            "doctor_id": payload.doctor_id,
+            "reason": payload.reason,
+            "apt_duration": payload.apt_duration,
+            "appointments": [
+                {"apt_id": apt_id, "apt_start": _as_utc(apt_start).isoformat()}
+                for apt_id, apt_start in rows
+            ],
+        },
+    )
+    db.commit()
+    db.refresh(series)
+    return series
+
+
+def update_series(
+    db: Session, series_id: int, payload: schemas.AppointmentSeriesUpdate
+) -> models.AppointmentSeries:
+    """database operation to edit every upcoming occurrence of a series at once"""
+    series = get_series_by_id(db, series_id)
+    if not series.active_status:
+        raise HTTPException(status_code=409, detail="Appointment series is cancelled")
+
+    changes = payload.model_dump(exclude_none=True)
+    if not changes:
+        return series
+
+    now = datetime.now(timezone.utc)
+    upcoming = and_(
+        models.Appointment.series_id == series_id,
+        models.Appointment.apt_start > now,
+    )
+
+    rows = _series_rows(db, upcoming, lock=True)
+    apt_ids = [apt_id for apt_id, _ in rows]
+
+    if rows and changes.get("apt_duration", 0) > series.apt_duration:
+        duration = timedelta(minutes=changes["apt_duration"])
+        slots = [(_as_utc(start), _as_utc(start) + duration) for _, start in rows]
+        _raise_on_conflicts(
+            db,
+            series.doctor_id,
+            series.patient_id,
+            slots,
+            exclude_series=series_id,
+        )
+
+    # the commit below expires every loaded row, no need to sync the session
+    if apt_ids:
+        db.execute(
+            update(models.Appointment)
+            .where(models.Appointment.apt_id.in_(apt_ids))
+            .values(**changes),
+            execution_options={"synchronize_session": False},
+        )
+    for field, value in changes.items():
+        setattr(series, field, value)
+    record_event(
+        db,
+        "series",
+        series_id,
+        "series.updated",
+        {
+            "series_id": series_id,
+            "after": now.isoformat(),
+            "apt_ids": apt_ids,
+            **changes,
+        },
+    )
+    db.commit()
+    db.refresh(series)
+    return series
+
+
+def cancel_series(db: Session, series_id: int) -> models.AppointmentSeries:
+    """database operation to cancel every upcoming occurrence of a series at once"""
+    series = get_series_by_id(db, series_id)
+    now = datetime.now(timezone.utc)
+
+    rows = _series_rows(
+        db,
+        and_(
+            models.Appointment.series_id == series_id,
+            models.Appointment.apt_start > now,
+        ),
+        lock=True,
+    )
+    apt_ids = [apt_id for apt_id, _ in rows]
+    if apt_ids:
+        db.execute(
+            delete(models.Appointment).where(models.Appointment.apt_id.in_(apt_ids)),
+            execution_options={"synchronize_session": False},
+        )
+    series.active_status = False
+    record_event(
+        db,
+        "series",
+        series_id,
+        "series.cancelled",
+        {"series_id": series_id, "after": now.isoformat(), "apt_ids": apt_ids},
+    )
+    db.commit()
+    db.refresh(series)
+    return series
+
+
+def _encode_cursor(apt_start: datetime, apt_id: int) -> str:
+    """opaque keyset cursor for (apt_start, apt_id)"""
+    raw = f"{_as_utc(apt_start).isoformat()}|{apt_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """inverse of _encode_cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        apt_start, apt_id = raw.split("|")
+        return _as_utc(datetime.fromisoformat(apt_start)), int(apt_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def get_patient_appointments(
+    db: Session,
+    patient_id: int,
+    when: str = "upcoming",
+    cursor: str | None = None,
+    limit: int = 20,
+) -> tuple[list[models.Appointment], str | None]:
+    """database operation to page through a patient's timeline by keyset"""
+    get_patient_by_id(db, patient_id)
+
+    now = datetime.now(timezone.utc)
+    apt_start, apt_id = models.Appointment.apt_start, models.Appointment.apt_id
+    query = select(models.Appointment).where(
+        models.Appointment.patient_id == patient_id
+    )
+
+    # upcoming reads forward from now, past reads backwards from now
+    if when == "upcoming":
+        query = query.where(apt_start >= now).order_by(apt_start, apt_id)
+    else:
+        query = query.where(apt_start < now).order_by(apt_start.desc(), apt_id.desc())
+
+    if cursor:
+        last_start, last_id = _decode_cursor(cursor)
+        if when == "upcoming":
+            after = or_(
+                apt_start > last_start, and_(apt_start == last_start, apt_id > last_id)
+            )
+        else:
+            after = or_(
+                apt_start < last_start, and_(apt_start == last_start, apt_id < last_id)
+            )
+        query = query.where(after)
+
+    rows = db.execute(query.limit(limit + 1)).scalars().all()
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = _encode_cursor(items[-1].apt_start, items[-1].apt_id)
+    return items, next_cursor
@@ -0,0 +1,125 @@
+"""
+BACKGROUND READINESS MONITOR
+
+Checks the DB pool and cache backend on a timer so health probes only read
+a cached snapshot and never do I/O themselves.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+
+from database import pool_capacity
+
+
+class HealthMonitor:
+    """periodically refreshed readiness snapshot"""
+
+    def __init__(
+        self,
+        engine_factory,
+        cache=None,
+        interval: float = 5.0,
+        timeout: float = 2.0,
+        max_saturation: float = 0.9,
+    ):
+        self._engine_factory = engine_factory
+        self._cache = cache
+        self.interval = interval
+        self.timeout = timeout
+        self.max_saturation = max_saturation
+        self._task: asyncio.Task | None = None
+        self._checked_at = 0.0
+        self._snapshot = {"status": "STARTING", "checks": {}, "checked_at": None}
+
+    @property
+    def ready(self) -> bool:
+        """ready only while the last check passed and is recent"""
+        fresh = time.monotonic() - self._checked_at < 3 * self.interval
+        return fresh and self._snapshot["status"] == "UP"
+
+    @property
+    def snapshot(self) -> dict:
+        """last check result, with status forced down once it goes stale"""
+        if self._snapshot["status"] == "UP" and not self.ready:
+            return {**self._snapshot, "status": "STALE"}
+        return self._snapshot
+
+    def _pool_saturation(self) -> float:
+        """share of the pool capacity currently checked out"""
+        engine = self._engine_factory()
+        capacity = pool_capacity(engine)
+        if not capacity or not hasattr(engine.pool, "checkedout"):
+            return 0.0
+        return engine.pool.checkedout() / capacity
+
+    def _ping_database(self):
+        """SELECT 1 through the pool"""
+        with self._engine_factory().connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    async def _check_database(self) -> dict:
+        """database connectivity, pool saturation is reported but never fails it"""
+        saturation = None
+        try:
+            saturation = self._pool_saturation()
+            if saturation >= self.max_saturation:
+                # a busy pool is serving traffic, a ping would only queue
+                # behind it, so report the load without failing readiness
+                return {"status": "UP", "pool_saturation": saturation, "busy": True}
+            await asyncio.wait_for(
+                asyncio.to_thread(self._ping_database), timeout=self.timeout
+            )
+        except Exception as exc:
+            return {
+                "status": "DOWN",
+                "pool_saturation": saturation,
+                "error": type(exc).__name__,
+            }
+        return {"status": "UP", "pool_saturation": saturation}
+
+    async def _check_cache(self) -> dict:
+        """cache backend reachability"""
+        if self._cache is None:
+            return {"status": "UP"}
+        try:
+            up = await asyncio.wait_for(self._cache.ping(), timeout=self.timeout)
+        except Exception:
+            up = False
+        return {"status": "UP" if up else "DOWN"}
+
+    async def check(self):
+        """run every check once and swap in the new snapshot"""
+        checks = {
+            "database": await self._check_database(),
+            "cache": await self._check_cache(),
+        }
+        healthy = all(check["status"] == "UP" for check in checks.values())
+        self._snapshot = {
+            "status": "UP" if healthy else "DOWN",
+            "checks": checks,
+            "checked_at": datetime.now(timezone.utc).isoformat(),
+        }
+        self._checked_at = time.monotonic()
+
+    async def _run(self):
+        while True:
+            await self.check()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """start the background task on the running loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """cancel the background task"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,167 @@
+"""
+OUTBOX DISPATCHER
+
+Publishes change events from the outbox table to a downstream sink in
+batches. Delivery is at-least-once: a batch is marked published only after
+the sink accepted it, so a crash in between republishes it.
+"""
+
+import asyncio
+import json
+import logging
+import queue
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlalchemy import select
+
+from models import models
+
+logger = logging.getLogger(__name__)
+
+
+def event_to_dict(event: models.OutboxEvent) -> dict:
+    """json-safe representation of an outbox row"""
+    return {
+        "event_id": event.event_id,
+        "publish_seq": event.publish_seq,
+        "aggregate_type": event.aggregate_type,
+        "aggregate_id": event.aggregate_id,
+        "event_type": event.event_type,
+        "payload": event.payload,
+        "created_at": event.created_at.isoformat() if event.created_at else None,
+    }
+
+
+class FileSink:
+    """appends events as JSON lines, stand-in for a real broker"""
+
+    def __init__(self, path: str | Path = "outbox_events.jsonl"):
+        self.path = Path(path)
+
+    def publish(self, events: list[dict]):
+        """write one batch"""
+        with self.path.open("a", encoding="utf-8") as out:
+            out.writelines(json.dumps(event) + "\n" for event in events)
+
+
+class QueueSink:
+    """hands events to an in-process queue"""
+
+    def __init__(self, events: queue.Queue | None = None):
+        self.events = events if events is not None else queue.Queue()
+
+    def publish(self, events: list[dict]):
+        """enqueue one batch"""
+        for event in events:
+            self.events.put(event)
+
+
+class OutboxDispatcher:
+    """background task moving outbox rows to the sink"""
+
+    def __init__(
+        self,
+        session_factory,
+        sink=None,
+        batch_size: int = 100,
+        interval: float = 0.5,
+        max_park: float = 2.0,
+    ):
+        self._session_factory = session_factory
+        self.sink = sink or FileSink()
+        self.batch_size = batch_size
+        self.interval = interval
+        # other workers' dispatchers publish without waking this one
+        self.max_park = max_park
+        self._task: asyncio.Task | None = None
+        self._published: asyncio.Event | None = None
+
+    def dispatch_batch(self) -> int:
+        """publish the oldest unpublished events, returns how many"""
+        db = self._session_factory()
+        try:
+            events = (
+                db.execute(
+                    select(models.OutboxEvent)
+                    .where(models.OutboxEvent.published_at.is_(None))
+                    .order_by(models.OutboxEvent.event_id)
+                    .limit(self.batch_size)
+                    # lets several workers dispatch without double-publishing
+                    .with_for_update(skip_locked=True)
+                )
+                .scalars()
+                .all()
+            )
+            if not events:
+                db.rollback()
+                return 0
+
+            # the counter row stays locked until commit, so a concurrent batch
+            # can't take lower sequence numbers and become visible after ours
+            sequence = db.get(models.OutboxSequence, 1, with_for_update=True)
+            if sequence is None:
+                sequence = models.OutboxSequence(seq_id=1, last_seq=0)
+                db.add(sequence)
+            published_at = datetime.now(timezone.utc)
+            for event in events:
+                sequence.last_seq += 1
+                event.publish_seq = sequence.last_seq
+                event.published_at = published_at
+
+            self.sink.publish([event_to_dict(event) for event in events])
+            db.commit()
+            return len(events)
+        finally:
+            db.close()
+
+    def next_publish(self) -> asyncio.Event | None:
+        """take this before checking for events, the next publish sets it"""
+        return self._published
+
+    async def wait_for_events(
+        self, timeout: float, published: asyncio.Event | None = None
+    ):
+        """park until published is set or the timeout runs out"""
+        timeout = min(timeout, self.max_park)
+        if published is None:
+            await asyncio.sleep(min(timeout, self.interval))
+            return
+        try:
+            await asyncio.wait_for(published.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def _notify(self):
+        """wake every waiter, later waiters park on a fresh event"""
+        published, self._published = self._published, asyncio.Event()
+        published.set()
+
+    async def _run(self):
+        while True:
+            try:
+                published = await asyncio.to_thread(self.dispatch_batch)
+            except Exception:
+                logger.exception("Outbox dispatch failed, retrying")
+                published = 0
+            if published:
+                self._notify()
+            # a full batch means there is likely a backlog, keep draining
+            if published < self.batch_size:
+                await asyncio.sleep(self.interval)
+
+    def start(self):
+        """start the background task on the running loop"""
+        if self._task is None:
+            self._published = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """cancel the background task"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
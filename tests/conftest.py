@@ -36,10 +36,16 @@
 
 #     app.dependency_overrides.clear()
 
+import os
+
 import pytest
 from fastapi.testclient import TestClient
 from unittest import mock
-from src.main import app
+
+# the lifespan must not publish outbox events from the production database
+os.environ["OUTBOX_DISPATCHER"] = "0"
+
+from src.main import app  # noqa: E402
 from src.database import get_db, get_engine
 
 
@@ -0,0 +1,133 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.middleware.admission import (
+    AdmissionControlMiddleware,
+    ConcurrencyLimiter,
+    InMemoryRateLimitStore,
+    RouteLimit,
+    classify,
+    limits_for_capacity,
+)
+
+
+@pytest.fixture
+def limited_client():
+    """
+    Tiny app behind the middleware with a burst of two requests per client.
+    """
+    app = FastAPI()
+
+    @app.get("/appointments")
+    def appointments():
+        return []
+
+    @app.get("/health")
+    async def health():
+        return {"status": "UP"}
+
+    app.add_middleware(
+        AdmissionControlMiddleware, rate=0.1, burst=2, api_keys=["partner-key"]
+    )
+    with TestClient(app) as c:
+        yield c
+
+
+def test_classify_routes():
+    assert classify("POST", "/appointments") == "booking"
+    assert classify("DELETE", "/appointment-series/1") == "booking"
+    assert classify("POST", "/patients") == "write"
+    assert classify("GET", "/appointments") == "read"
+
+
+def test_token_bucket():
+    store = InMemoryRateLimitStore()
+
+    async def drain():
+        return [await store.take("ip:1", rate=1.0, burst=2) for _ in range(3)]
+
+    first, second, third = asyncio.run(drain())
+    assert first == second == 0
+    assert 0 < third <= 1
+
+
+def test_rate_limit_rejects_with_retry_after(limited_client):
+    assert limited_client.get("/appointments").status_code == 200
+    assert limited_client.get("/appointments").status_code == 200
+    response = limited_client.get("/appointments")
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_unknown_api_key_limited_by_ip(limited_client):
+    for _ in range(2):
+        limited_client.get("/appointments")
+    for key in ("random-1", "random-2"):
+        response = limited_client.get("/appointments", headers={"X-API-Key": key})
+        assert response.status_code == 429
+
+
+def test_configured_api_key_gets_own_bucket(limited_client):
+    for _ in range(2):
+        limited_client.get("/appointments")
+    response = limited_client.get("/appointments", headers={"X-API-Key": "partner-key"})
+    assert response.status_code == 200
+
+
+def test_health_bypasses_admission(limited_client):
+    for _ in range(5):
+        assert limited_client.get("/health").status_code == 200
+
+
+def test_concurrency_limiter_sheds_when_queue_full():
+    limiter = ConcurrencyLimiter(
+        RouteLimit(max_concurrency=1, max_queue=0, max_wait=0.01)
+    )
+
+    async def scenario():
+        assert await limiter.acquire()
+        shed = not await limiter.acquire()
+        limiter.release()
+        return shed
+
+    assert asyncio.run(scenario())
+
+
+def test_token_bucket_evicts_least_recent_key():
+    store = InMemoryRateLimitStore(max_keys=2)
+
+    async def scenario():
+        await store.take("ip:1", rate=0.001, burst=1)
+        await store.take("ip:2", rate=0.001, burst=1)
+        # touching ip:1 again makes ip:2 the oldest
+        limited = await store.take("ip:1", rate=0.001, burst=1)
+        await store.take("ip:3", rate=0.001, burst=1)
+        return limited, list(store._buckets)
+
+    limited, keys = asyncio.run(scenario())
+    assert limited > 0
+    assert keys == ["ip:1", "ip:3"]
+
+
+def test_limits_fit_pool_capacity():
+    limits = limits_for_capacity(15)
+    pooled = sum(limits[name].max_concurrency for name in ("booking", "write", "read"))
+    assert pooled == 15
+    # never more handlers than anyio has threads
+    limits = limits_for_capacity(200)
+    assert (
+        sum(limits[name].max_concurrency for name in ("booking", "write", "read")) == 40
+    )
+
+
+def test_limits_beyond_pool_rejected():
+    limits = {
+        "booking": RouteLimit(max_concurrency=8, max_queue=16, max_wait=0.5),
+        "write": RouteLimit(max_concurrency=16, max_queue=32, max_wait=0.5),
+        "read": RouteLimit(max_concurrency=32, max_queue=64, max_wait=1.0),
+    }
+    with pytest.raises(ValueError, match="only fit 15"):
+        AdmissionControlMiddleware(FastAPI(), limits=limits, capacity=15)
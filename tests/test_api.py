@@ -1,6 +1,10 @@
 import pytest
 from datetime import datetime, timezone, timedelta
 from src.schemas import schemas
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from src.main import app
+from src.services import crud
 
 
 # Mock CRUD operations
@@ -103,6 +107,27 @@ def mock_create_appointment(mocker):
     )
 
 
+@pytest.fixture
+def mock_create_series(mocker):
+    return mocker.patch(
+        "src.main.crud.create_series",
+        return_value=schemas.AppointmentSeriesRead(
+            series_id=1,
+            patient_id=1,
+            doctor_id=1,
+            reason="Follow-up",
+            freq="WEEKLY",
+            interval=2,
+            count=3,
+            until=None,
+            dtstart=datetime(2030, 1, 7, 9, 0, 0, tzinfo=timezone.utc),
+            apt_duration=30,
+            active_status=True,
+            created_at=datetime(2023, 2, 2, 12, 0, 0, tzinfo=timezone.utc),
+        ),
+    )
+
+
 # Test cases
 def test_create_patient(client, mock_create_patient):
     payload = {
@@ -130,6 +155,22 @@ def test_create_patient_invalid(client):
     assert response.status_code == 422
 
 
+def test_create_patient_invalid_messages():
+    payload = {
+        "first_name": "John",
+        "last_name": "Doe",
+        "email": "johndoeexample.com",
+        "phone": "12345",
+    }
+    # not entered, so the lifespan never touches the database
+    response = TestClient(app).post("/patients", json=payload)
+    assert response.status_code == 422
+    assert {e["loc"][-1]: e["msg"] for e in response.json()["detail"]} == {
+        "email": "Value error, Invalid email address",
+        "phone": "Value error, Phone number must be between 10 and 15 digits",
+    }
+
+
 def test_get_patient(client, mock_get_patient_by_id):
     response = client.get("/patients/1")
     assert response.status_code == 200
@@ -250,3 +291,192 @@ def test_health_check(client):
     response = client.get("/health")
     assert response.status_code == 200
     assert response.json() == {"status": "UP"}
+
+
+def test_expand_occurrences_weekly_interval():
+    start = datetime(2030, 1, 7, 9, 0, 0, tzinfo=timezone.utc)
+    occurrences = list(crud.expand_occurrences(start, "WEEKLY", interval=2, count=3))
+    assert occurrences == [
+        start,
+        start + timedelta(weeks=2),
+        start + timedelta(weeks=4),
+    ]
+
+
+def test_expand_occurrences_stops_at_until():
+    start = datetime(2030, 1, 7, 9, 0, 0, tzinfo=timezone.utc)
+    until = start + timedelta(days=3)
+    assert len(list(crud.expand_occurrences(start, "DAILY", until=until))) == 4
+
+
+def test_expand_occurrences_keeps_wall_time_across_dst():
+    # Europe/London moves to BST on 2030-03-31
+    start = datetime(2030, 3, 25, 9, 0, 0, tzinfo=timezone.utc)
+    occurrences = list(
+        crud.expand_occurrences(start, "WEEKLY", count=2, tz="Europe/London")
+    )
+    assert [o.hour for o in occurrences] == [9, 9]
+    assert occurrences[1].astimezone(timezone.utc) == datetime(
+        2030, 4, 1, 8, 0, 0, tzinfo=timezone.utc
+    )
+
+
+def test_series_unknown_time_zone_rejected():
+    with pytest.raises(ValueError, match="Unknown time zone"):
+        schemas.AppointmentSeriesCreate(
+            patient_id=1,
+            doctor_id=1,
+            apt_start=datetime(2030, 1, 7, 9, 0, 0, tzinfo=timezone.utc),
+            apt_duration=30,
+            count=2,
+            tz="Mars/Olympus_Mons",
+        )
+
+
+def test_find_conflicts_sweep():
+    start = datetime(2030, 1, 7, 9, 0, 0, tzinfo=timezone.utc)
+    slots = [
+        (start + timedelta(weeks=n), start + timedelta(weeks=n, minutes=30))
+        for n in range(3)
+    ]
+    booked = [
+        # long booking ending exactly when the first slot starts
+        (start - timedelta(hours=2), start),
+        (start + timedelta(weeks=1, minutes=15), start + timedelta(weeks=1, hours=1)),
+    ]
+    assert crud.find_conflicts(slots, booked) == [start + timedelta(weeks=1)]
+
+
+def test_create_appointment_series(client, mock_create_series):
+    payload = {
+        "patient_id": 1,
+        "doctor_id": 1,
+        "reason": "Follow-up",
+        "apt_start": datetime(2030, 1, 7, 9, 0, 0, tzinfo=timezone.utc).isoformat(),
+        "apt_duration": 30,
+        "freq": "WEEKLY",
+        "interval": 2,
+        "count": 3,
+    }
+    response = client.post("/appointment-series", json=payload)
+    assert response.status_code == 201
+    assert response.json()["series_id"] == 1
+
+
+def test_create_appointment_series_unbounded(client):
+    payload = {
+        "patient_id": 1,
+        "doctor_id": 1,
+        "apt_start": datetime(2030, 1, 7, 9, 0, 0, tzinfo=timezone.utc).isoformat(),
+        "apt_duration": 30,
+    }
+    response = client.post("/appointment-series", json=payload)
+    assert response.status_code == 422
+
+
+def test_patient_contact_normalization():
+    patient = schemas.PatientCreate(
+        first_name="John",
+        last_name="Doe",
+        email=" JohnDoe@Example.COM ",
+        phone="(123) 456-7890",
+    )
+    assert patient.email == "JohnDoe@example.com"
+    assert patient.phone == "1234567890"
+
+
+def test_batch_validation():
+    rows = [
+        {
+            "patient_id": 1,
+            "doctor_id": 1,
+            "apt_start": "2030-01-07T09:00:00+00:00",
+            "apt_duration": 30,
+        },
+        {
+            "patient_id": 1,
+            "doctor_id": 1,
+            "apt_start": "2030-01-07T09:00:00",
+            "apt_duration": 30,
+        },
+    ]
+    with pytest.raises(ValueError) as exc:
+        schemas.AppointmentCreateList.validate_python(rows)
+    assert exc.value.errors()[0]["loc"] == (1, "apt_start")
+
+
+def test_liveness_check(client):
+    response = client.get("/health/live")
+    assert response.status_code == 200
+    assert response.json() == {"status": "UP"}
+
+
+def test_get_patient_appointments(client, mocker):
+    mock_appointment = schemas.AppointmentRead(
+        apt_id=1,
+        patient_id=1,
+        doctor_id=1,
+        reason="Check-up",
+        apt_start=datetime(2030, 2, 2, 12, 0, 0, tzinfo=timezone.utc),
+        apt_duration=30,
+        apt_created_at=datetime(2023, 2, 2, 12, 0, 0, tzinfo=timezone.utc),
+    )
+    mock_page = mocker.patch(
+        "src.main.crud.get_patient_appointments",
+        return_value=([mock_appointment], "next"),
+    )
+    response = client.get("/patients/1/appointments?when=past&limit=1")
+    assert response.status_code == 200
+    assert response.json()["items"][0]["apt_id"] == mock_appointment.apt_id
+    assert response.json()["next_cursor"] == "next"
+    mock_page.assert_called_once_with(mocker.ANY, 1, when="past", cursor=None, limit=1)
+
+
+def test_appointment_cursor_roundtrip():
+    apt_start = datetime(2030, 2, 2, 12, 0, 0, tzinfo=timezone.utc)
+    cursor = crud._encode_cursor(apt_start, 42)
+    assert crud._decode_cursor(cursor) == (apt_start, 42)
+
+
+def test_appointment_cursor_invalid():
+    with pytest.raises(HTTPException) as exc:
+        crud._decode_cursor("not-a-cursor")
+    assert exc.value.status_code == 400
+
+
+def _overlap_db(mocker, overlaps):
+    db = mocker.Mock(name="Session")
+    db.get.return_value = mocker.Mock(active_status=True)
+    db.execute.return_value.scalars.return_value.all.return_value = overlaps
+    return db
+
+
+def _future_appointment():
+    return schemas.AppointmentCreate(
+        patient_id=1,
+        doctor_id=1,
+        reason="Check-up",
+        apt_start=datetime.now(timezone.utc) + timedelta(days=1),
+        apt_duration=30,
+    )
+
+
+def test_create_appointment_patient_conflict(mocker):
+    db = _overlap_db(mocker, [mocker.Mock(doctor_id=2, patient_id=1)])
+    with pytest.raises(HTTPException) as exc:
+        crud.create_appointment(db, _future_appointment())
+    assert exc.value.status_code == 409
+    assert exc.value.detail == "Patient has a conflicting appointment"
+    db.add.assert_not_called()
+
+
+def test_create_appointment_doctor_conflict_wins(mocker):
+    overlaps = [
+        mocker.Mock(doctor_id=2, patient_id=1),
+        mocker.Mock(doctor_id=1, patient_id=3),
+    ]
+    db = _overlap_db(mocker, overlaps)
+    with pytest.raises(HTTPException) as exc:
+        crud.create_appointment(db, _future_appointment())
+    assert exc.value.status_code == 409
+    assert exc.value.detail == "Doctor has a conflicting appointment"
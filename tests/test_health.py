@@ -0,0 +1,105 @@
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+from src.main import app
+from src.services.health import HealthMonitor
+
+
+class _Cache:
+    def __init__(self, up):
+        self.up = up
+
+    async def ping(self):
+        return self.up
+
+
+@pytest.fixture
+def sqlite_engine(tmp_path):
+    """
+    File-backed SQLite engine so the pool is a real QueuePool.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'health.db'}")
+    yield engine
+    engine.dispose()
+
+
+def test_monitor_starts_not_ready(sqlite_engine):
+    monitor = HealthMonitor(lambda: sqlite_engine)
+    assert not monitor.ready
+    assert monitor.snapshot["status"] == "STARTING"
+
+
+def test_monitor_ready_after_check(sqlite_engine):
+    monitor = HealthMonitor(lambda: sqlite_engine, cache=_Cache(True))
+    asyncio.run(monitor.check())
+    assert monitor.ready
+    assert monitor.snapshot["checks"]["database"]["status"] == "UP"
+
+
+def test_monitor_cache_down(sqlite_engine):
+    monitor = HealthMonitor(lambda: sqlite_engine, cache=_Cache(False))
+    asyncio.run(monitor.check())
+    assert not monitor.ready
+    assert monitor.snapshot["checks"]["cache"]["status"] == "DOWN"
+
+
+def test_monitor_database_down(mocker):
+    engine = mocker.MagicMock(name="Engine")
+    engine.connect.side_effect = ConnectionError("pool is dead")
+    engine.pool = object()
+    monitor = HealthMonitor(lambda: engine)
+    asyncio.run(monitor.check())
+    assert not monitor.ready
+    assert monitor.snapshot["checks"]["database"]["error"] == "ConnectionError"
+
+
+def test_saturated_pool_stays_ready(sqlite_engine, mocker):
+    monitor = HealthMonitor(lambda: sqlite_engine)
+    mocker.patch.object(sqlite_engine.pool, "checkedout", return_value=15)
+    ping = mocker.patch.object(monitor, "_ping_database")
+    asyncio.run(monitor.check())
+    assert monitor.ready
+    database = monitor.snapshot["checks"]["database"]
+    assert database["pool_saturation"] == 1.0
+    assert database["busy"]
+    ping.assert_not_called()
+
+
+def test_monitor_goes_stale(sqlite_engine):
+    monitor = HealthMonitor(lambda: sqlite_engine, interval=0.01)
+    asyncio.run(monitor.check())
+    asyncio.run(asyncio.sleep(0.05))
+    assert not monitor.ready
+    assert monitor.snapshot["status"] == "STALE"
+
+
+def _readiness(mocker, status, checks):
+    """
+    /health/ready served from a monitor holding a fresh snapshot.
+    The client is not entered, so no lifespan task overwrites it.
+    """
+    monitor = HealthMonitor(lambda: None)
+    monitor._snapshot = {"status": status, "checks": checks, "checked_at": "now"}
+    monitor._checked_at = time.monotonic()
+    mocker.patch("src.main.health_monitor", monitor)
+    return TestClient(app).get("/health/ready")
+
+
+def test_readiness_up(mocker):
+    response = _readiness(mocker, "UP", {"database": {"status": "UP"}})
+    assert response.status_code == 200
+    assert response.json()["status"] == "UP"
+
+
+def test_readiness_down(mocker):
+    checks = {
+        "database": {"status": "DOWN", "error": "OperationalError"},
+        "cache": {"status": "UP"},
+    }
+    response = _readiness(mocker, "DOWN", checks)
+    assert response.status_code == 503
+    assert response.json()["checks"] == checks
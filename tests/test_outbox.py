@@ -0,0 +1,221 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src import main
+from src.schemas import schemas
+from src.services import crud
+from src.services.outbox import FileSink, OutboxDispatcher, QueueSink
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """
+    Sessions on a throwaway SQLite database with the full schema.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'outbox.db'}")
+    crud.models.Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def _create_patient(session_factory, n=0):
+    db = session_factory()
+    try:
+        return crud.create_patient(
+            db,
+            schemas.PatientCreate(
+                first_name="John",
+                last_name="Doe",
+                email=f"johndoe{n}@example.com",
+                phone="1234567890",
+            ),
+        ).pat_id
+    finally:
+        db.close()
+
+
+def test_write_appends_event_in_same_transaction(session_factory):
+    pat_id = _create_patient(session_factory)
+    db = session_factory()
+    events = db.query(crud.models.OutboxEvent).all()
+    assert [(e.event_type, e.aggregate_id) for e in events] == [
+        ("patient.created", pat_id)
+    ]
+    assert events[0].published_at is None
+    db.close()
+
+
+def test_feed_only_serves_published_events(session_factory):
+    _create_patient(session_factory)
+    db = session_factory()
+    assert crud.get_events_after(db, after=0) == []
+    db.close()
+
+    sink = QueueSink()
+    dispatcher = OutboxDispatcher(session_factory, sink=sink)
+    assert dispatcher.dispatch_batch() == 1
+    assert dispatcher.dispatch_batch() == 0
+    assert sink.events.get_nowait()["event_type"] == "patient.created"
+
+    db = session_factory()
+    events = crud.get_events_after(db, after=0)
+    assert len(events) == 1
+    assert crud.get_events_after(db, after=events[0].publish_seq) == []
+    db.close()
+
+
+def test_dispatch_in_batches(session_factory, tmp_path):
+    for n in range(5):
+        _create_patient(session_factory, n)
+    path = tmp_path / "events.jsonl"
+    dispatcher = OutboxDispatcher(session_factory, sink=FileSink(path), batch_size=2)
+    assert [dispatcher.dispatch_batch() for _ in range(4)] == [2, 2, 1, 0]
+    published = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [event["publish_seq"] for event in published] == [1, 2, 3, 4, 5]
+
+
+def _add_event(session_factory, event_id):
+    db = session_factory()
+    db.add(
+        crud.models.OutboxEvent(
+            event_id=event_id,
+            aggregate_type="patient",
+            aggregate_id=event_id,
+            event_type="patient.created",
+            payload={},
+        )
+    )
+    db.commit()
+    db.close()
+
+
+def test_lower_id_published_late_is_served(session_factory):
+    dispatcher = OutboxDispatcher(session_factory, sink=QueueSink())
+    db = session_factory()
+
+    # id 11 commits and is published while id 10 is still in flight
+    _add_event(session_factory, 11)
+    dispatcher.dispatch_batch()
+    first = crud.get_events_after(db, after=0)
+    assert [event.event_id for event in first] == [11]
+
+    _add_event(session_factory, 10)
+    dispatcher.dispatch_batch()
+    late = crud.get_events_after(db, after=first[-1].publish_seq)
+    assert [(event.event_id, event.publish_seq) for event in late] == [(10, 2)]
+    db.close()
+
+
+def test_wait_for_events_wakes_on_publish(session_factory):
+    dispatcher = OutboxDispatcher(session_factory, sink=QueueSink(), interval=0.01)
+
+    async def scenario():
+        dispatcher.start()
+        try:
+            published = dispatcher.next_publish()
+            waiter = asyncio.create_task(dispatcher.wait_for_events(5, published))
+            await asyncio.to_thread(_create_patient, session_factory)
+            await asyncio.wait_for(waiter, timeout=2)
+        finally:
+            await dispatcher.stop()
+
+    asyncio.run(scenario())
+
+
+def test_publish_between_query_and_wait_still_wakes(session_factory):
+    dispatcher = OutboxDispatcher(session_factory, sink=QueueSink(), max_park=5)
+
+    async def scenario():
+        dispatcher._published = asyncio.Event()
+        published = dispatcher.next_publish()
+        # the feed found nothing, then a batch is published before it parks
+        dispatcher._notify()
+        await asyncio.wait_for(dispatcher.wait_for_events(5, published), timeout=1)
+
+    asyncio.run(scenario())
+
+
+def test_dispatch_failure_is_logged(session_factory, caplog):
+    class _BrokenSink:
+        def publish(self, events):
+            raise ConnectionError("broker down")
+
+    _create_patient(session_factory)
+    dispatcher = OutboxDispatcher(session_factory, sink=_BrokenSink(), interval=0.01)
+
+    async def scenario():
+        dispatcher.start()
+        await asyncio.sleep(0.1)
+        await dispatcher.stop()
+
+    asyncio.run(scenario())
+    assert "Outbox dispatch failed" in caplog.text
+    assert "broker down" in caplog.text
+
+
+@pytest.fixture
+def feed(mocker):
+    """
+    /events with a mocked session, without running the lifespan.
+    """
+    db = mocker.Mock(name="Session")
+
+    def override_get_db():
+        yield db
+
+    main.app.dependency_overrides[main.get_db] = override_get_db
+    yield TestClient(main.app), db
+    main.app.dependency_overrides.clear()
+
+
+def _event(publish_seq):
+    return schemas.EventRead(
+        event_id=publish_seq + 10,
+        publish_seq=publish_seq,
+        aggregate_type="patient",
+        aggregate_id=1,
+        event_type="patient.created",
+        payload={},
+        created_at=datetime(2030, 1, 1, tzinfo=timezone.utc),
+    )
+
+
+def test_feed_without_events_keeps_cursor(feed, mocker):
+    client, db = feed
+    mocker.patch("src.main.crud.get_events_after", return_value=[])
+    response = client.get("/events?after=7")
+    assert response.status_code == 200
+    assert response.json() == {"events": [], "next_cursor": 7}
+    db.close.assert_not_called()
+
+
+def test_feed_long_poll_returns_new_events(feed, mocker):
+    client, db = feed
+    get_events = mocker.patch(
+        "src.main.crud.get_events_after", side_effect=[[], [_event(3)]]
+    )
+    wait = mocker.patch.object(
+        main.outbox_dispatcher, "wait_for_events", new=mocker.AsyncMock()
+    )
+    response = client.get("/events?after=2&wait=10")
+    assert response.status_code == 200
+    assert [e["publish_seq"] for e in response.json()["events"]] == [3]
+    assert response.json()["next_cursor"] == 3
+    assert get_events.call_count == 2
+    wait.assert_awaited_once()
+    # the connection goes back to the pool while parked
+    db.close.assert_called_once()
+
+
+def test_feed_long_poll_times_out(feed, mocker):
+    client, db = feed
+    mocker.patch("src.main.crud.get_events_after", return_value=[])
+    response = client.get("/events?after=5&wait=0.05")
+    assert response.json() == {"events": [], "next_cursor": 5}
+    assert db.close.called
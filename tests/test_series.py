@@ -0,0 +1,163 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from src.schemas import schemas
+from src.services import crud
+
+models = crud.models
+
+
+@pytest.fixture
+def db(tmp_path):
+    """
+    Session on a throwaway SQLite database with one patient and two doctors.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'series.db'}")
+    models.Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all(
+        [
+            models.Patient(
+                first_name="John",
+                last_name="Doe",
+                email="johndoe@example.com",
+                phone="1234567890",
+            ),
+            models.Patient(
+                first_name="Jane",
+                last_name="Doe",
+                email="janedoe@example.com",
+                phone="1234567890",
+            ),
+            models.Doctor(name="Dr. Smith", specialty="Cardiology", active_status=True),
+        ]
+    )
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def start():
+    return (datetime.now(timezone.utc) + timedelta(days=1)).replace(microsecond=0)
+
+
+def _series(start, **overrides):
+    fields = {
+        "patient_id": 1,
+        "doctor_id": 1,
+        "reason": "Follow-up",
+        "apt_start": start,
+        "apt_duration": 30,
+        "freq": "WEEKLY",
+        "count": 4,
+    }
+    fields.update(overrides)
+    return schemas.AppointmentSeriesCreate(**fields)
+
+
+def _book(db, start, patient_id=2, series_id=None, reason="Other"):
+    apt = models.Appointment(
+        patient_id=patient_id,
+        doctor_id=1,
+        series_id=series_id,
+        reason=reason,
+        apt_start=start,
+        apt_duration=30,
+    )
+    db.add(apt)
+    db.commit()
+    return apt
+
+
+def _occurrences(db, series_id):
+    return (
+        db.execute(
+            select(models.Appointment)
+            .where(models.Appointment.series_id == series_id)
+            .order_by(models.Appointment.apt_start)
+        )
+        .scalars()
+        .all()
+    )
+
+
+def test_until_past_cap_rejected(start):
+    with pytest.raises(ValidationError):
+        _series(start, freq="DAILY", count=None, until=start + timedelta(days=364))
+
+
+def test_create_series_books_every_occurrence(db, start):
+    series = crud.create_series(db, _series(start))
+    assert [crud._as_utc(apt.apt_start) for apt in _occurrences(db, 1)] == [
+        start + timedelta(weeks=n) for n in range(4)
+    ]
+    assert series.dtstart is not None
+
+
+def test_create_series_doctor_conflict(db, start):
+    _book(db, start + timedelta(weeks=2, minutes=15))
+    with pytest.raises(HTTPException) as exc:
+        crud.create_series(db, _series(start))
+    assert exc.value.status_code == 409
+    assert exc.value.detail.startswith("Doctor has conflicting appointments")
+    assert db.execute(select(models.AppointmentSeries)).first() is None
+
+
+def test_update_series_duration_excludes_own_rows(db, start):
+    crud.create_series(db, _series(start))
+    # every occurrence overlaps itself, so this only passes if they're excluded
+    series = crud.update_series(db, 1, schemas.AppointmentSeriesUpdate(apt_duration=60))
+    assert series.apt_duration == 60
+    assert {apt.apt_duration for apt in _occurrences(db, 1)} == {60}
+
+
+def test_update_series_duration_conflict(db, start):
+    crud.create_series(db, _series(start))
+    _book(db, start + timedelta(weeks=1, minutes=45))
+    with pytest.raises(HTTPException) as exc:
+        crud.update_series(db, 1, schemas.AppointmentSeriesUpdate(apt_duration=60))
+    assert exc.value.status_code == 409
+    assert {apt.apt_duration for apt in _occurrences(db, 1)} == {30}
+
+
+def test_update_series_leaves_past_occurrences(db, start):
+    crud.create_series(db, _series(start))
+    _book(db, start - timedelta(weeks=2), patient_id=1, series_id=1, reason="Old")
+    crud.update_series(db, 1, schemas.AppointmentSeriesUpdate(reason="New"))
+    assert [apt.reason for apt in _occurrences(db, 1)] == ["Old"] + ["New"] * 4
+
+
+def test_cancel_series_deletes_only_future(db, start):
+    crud.create_series(db, _series(start))
+    _book(db, start - timedelta(weeks=2), patient_id=1, series_id=1, reason="Old")
+    series = crud.cancel_series(db, 1)
+    assert not series.active_status
+    assert [apt.reason for apt in _occurrences(db, 1)] == ["Old"]
+
+
+def _payload(db, event_type):
+    event = db.execute(
+        select(models.OutboxEvent).where(models.OutboxEvent.event_type == event_type)
+    ).scalar_one()
+    return event.payload
+
+
+def test_series_events_carry_apt_ids(db, start):
+    crud.create_series(db, _series(start))
+    apt_ids = [apt.apt_id for apt in _occurrences(db, 1)]
+    created = _payload(db, "series.created")
+    assert [apt["apt_id"] for apt in created["appointments"]] == apt_ids
+
+    _book(db, start - timedelta(weeks=2), patient_id=1, series_id=1, reason="Old")
+    crud.update_series(db, 1, schemas.AppointmentSeriesUpdate(reason="New"))
+    assert _payload(db, "series.updated")["apt_ids"] == apt_ids
+
+    crud.cancel_series(db, 1)
+    assert _payload(db, "series.cancelled")["apt_ids"] == apt_ids